@@ -1,39 +1,111 @@
+import contextlib
+import copy
 import json
 import os
-from datetime import datetime, timedelta, date
-import argparse
-import math
+import re
+import sys
+from datetime import timedelta, date
 
-CONFIG_FILE = os.path.expanduser("~/.noter-config")
+# Resolved once; _expand() reuses it instead of looking up $HOME per call
+_HOME = os.path.expanduser("~")
+
+
+def _expand(path):
+    """Expand a leading ``~`` in path using the home directory cached at import."""
+    if path == "~":
+        return _HOME
+    if path.startswith(("~/", "~" + os.sep)):
+        return _HOME.rstrip("/" + os.sep) + path[1:]
+    return os.path.expanduser(path)
+
+
+CONFIG_FILE = _expand("~/.noter-config")
+_DEFAULT_BASE_DIR = _expand("~/.notes")
+
+# Parsed config keyed by the config file's mtime, see load_config()
+_config_cache = {"mtime": None, "data": None}
+
+
+def _read_config():
+    """Return the parsed config file, or None when it is missing or unparsable.
+
+    The parsed file is cached until its mtime changes, so repeated calls
+    within a process cost a single stat().
+    """
+    try:
+        mtime = os.stat(CONFIG_FILE).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+    if _config_cache["mtime"] != mtime:
+        try:
+            with open(CONFIG_FILE, 'r') as f:
+                data = json.load(f)
+        except json.JSONDecodeError:
+            return None
+        if "base_dir" in data:
+            # Expanded here once so commands can use the path as-is
+            data["base_dir"] = _expand(data["base_dir"])
+        _config_cache["mtime"] = mtime
+        _config_cache["data"] = data
+
+    return _config_cache["data"]
 
 
 def load_config():
     """Load configuration from file."""
-    if not os.path.exists(CONFIG_FILE):
-        return {"base_dir": os.path.expanduser("~/.notes")}
+    data = _read_config()
+    if data is None:
+        return {"base_dir": _DEFAULT_BASE_DIR}
 
-    try:
-        with open(CONFIG_FILE, 'r') as f:
-            return json.load(f)
-    except json.JSONDecodeError:
-        return {"base_dir": os.path.expanduser("~/.notes")}
+    # Callers mutate the result before save_config(), hand out a copy
+    return copy.copy(data)
 
 
 def save_config(config):
-    """Save configuration to file."""
-    with open(CONFIG_FILE, 'w+') as f:
+    """Save configuration to file.
+
+    The config is written to a temporary file and renamed over the old one,
+    so an interrupted write never leaves a truncated config behind.
+    """
+    tmp_file = CONFIG_FILE + '.tmp'
+    with open(tmp_file, 'w') as f:
         json.dump(config, f, indent=2)
+    os.replace(tmp_file, CONFIG_FILE)
+    _config_cache["mtime"] = None
 
 
 def set_base_dir(base_dir):
     """Set and save base directory configuration."""
-    base_dir = os.path.expanduser(base_dir)
-    config = load_config()
-    config["base_dir"] = base_dir
-    save_config(config)
+    base_dir = _expand(base_dir)
+    # Only a parsed config file already holding base_dir can skip the write
+    stored = _read_config()
+    if stored is None or stored.get("base_dir") != base_dir:
+        config = load_config()
+        config["base_dir"] = base_dir
+        save_config(config)
 
     return base_dir
 
+# Notes at least this large are memory-mapped instead of read into memory
+_MMAP_THRESHOLD = 64 * 1024
+
+# Note markers, matched against raw bytes so notes never need decoding
+_SEC_PREFIX = b'##'
+_TASKS_HDR = b'## Tasks'
+_EXPECTED_HDR = b'## Expected for Tomorrow'
+_CHECK_OPEN = b'- [ ]'
+_CHECK_DONE = b'- [x]'
+
+# A carry-over section header and the body lines up to the next header
+_CARRY_SECTION_RE = re.compile(
+    rb'^(' + re.escape(_TASKS_HDR) + rb'|' + re.escape(_EXPECTED_HDR) + rb')[^\n]*(?:\n|\Z)'
+    rb'((?:(?!' + _SEC_PREFIX + rb')[^\n]*\n)*(?:(?!' + _SEC_PREFIX + rb')[^\n]+)?)',
+    re.M)
+# Task lines collected from the Tasks and Expected for Tomorrow bodies
+_OPEN_TASK_RE = re.compile(rb'^' + re.escape(_CHECK_OPEN) + rb'[^\r\n]*', re.M)
+_EXPECTED_TASK_RE = re.compile(rb'^-[^\r\n]*', re.M)
+
 # Previous template definition remains the same
 TEMPLATE = """# Daily Note - {date} - {project_name}
 
@@ -57,33 +129,40 @@ TEMPLATE = """# Daily Note - {date} - {project_name}
 - What could be improved?
 """
 
+# Placeholder tasks for a note with nothing to carry over
+_TEMPLATE_TASKS = '\n'.join(" -  Task {}".format(i) for i in range(3))
+
+
 def get_template_tasks():
-    output = []
-    for i in range(3):
-        output.append(" -  Task {}".format(i))
-    return '\n'.join(output)
+    return _TEMPLATE_TASKS
 
-# Previous functions remain the same (get_incomplete_tasks, get_expected_tasks)
-def get_incomplete_tasks(filename):
-    """Extract incomplete tasks from a previous note."""
-    if not os.path.exists(filename):
-        return []
+def get_carry_tasks(filename):
+    """Extract incomplete and expected tasks from a previous note in one pass.
 
-    with open(filename, 'r') as file:
-        content = file.read()
+    Returns a tuple ``(incomplete, expected)`` with the open ``- [ ]`` items
+    of the Tasks sections and the ``-`` items of Expected for Tomorrow.
+    """
+    incomplete = []
+    expected = []
+
+    try:
+        with _open_note_buffer(filename) as buffer:
+            for section in _CARRY_SECTION_RE.finditer(buffer):
+                start, end = section.span(2)
+                if section.group(1) == _TASKS_HDR:
+                    incomplete.extend(_OPEN_TASK_RE.findall(buffer, start, end))
+                else:
+                    expected.extend(_EXPECTED_TASK_RE.findall(buffer, start, end))
+    except FileNotFoundError:
+        return [], []
 
-    tasks = []
-    in_tasks_section = False
+    return ([task.decode('utf-8') for task in incomplete],
+            [task.decode('utf-8') for task in expected])
 
-    for line in content.split('\n'):
-        if '## Tasks' in line:
-            in_tasks_section = True
-        elif line.startswith('##'):
-            in_tasks_section = False
-        elif in_tasks_section and line.startswith('- [ ]'):
-            tasks.append(line)
 
-    return tasks
+def get_incomplete_tasks(filename):
+    """Extract incomplete tasks from a previous note."""
+    return get_carry_tasks(filename)[0]
 
 
 def get_important_items(filename):
@@ -91,42 +170,46 @@ def get_important_items(filename):
     [!] - open items
     [!!] - closed items
     """
-    if not os.path.exists(filename):
-        return []
-
+    note_date = os.path.basename(filename).replace('.md', '')
     items = []
     current_section = None
     current_text = []
 
-    with open(filename, 'r', encoding='utf-8') as file:
-        for line in file:
-
-            if line.startswith('##'):
-                current_section = line[2:].strip()
-                continue
-
-            if current_text:  # If we're in an item, collect additional lines
-                current_text.append(line)
-
-            if '[!]' in line:
-                current_text = [' ', line]
-
-            if '[!!]' in line:
-                if current_text:  # Save previous item if exists
-                    items.append({
-                        'item': ''.join(current_text).split('[!]')[1].split('[!!]')[0],
-                        'section': current_section,
-                        'date': os.path.basename(filename).replace('.md', ''),
-                    })
-                current_text = []
-
+    try:
+        with open(filename, 'r', encoding='utf-8') as file:
+            for line in file:
+
+                if line.startswith('##'):
+                    current_section = line[2:].strip()
+                    continue
+
+                if current_text:  # If we're in an item, collect additional lines
+                    current_text.append(line)
+
+                if '[!]' in line:
+                    current_text = [' ', line]
+
+                if '[!!]' in line:
+                    if current_text:  # Save previous item if exists
+                        text = ''.join(current_text)
+                        # The item runs from the first [!] up to the next [!] or [!!]
+                        start = text.find('[!]') + 3
+                        ends = [end for end in (text.find('[!]', start), text.find('[!!]', start))
+                                if end != -1]
+                        items.append({
+                            'item': text[start:min(ends, default=len(text))],
+                            'section': current_section,
+                            'date': note_date,
+                        })
+                    current_text = []
+    except FileNotFoundError:
+        return []
 
     return items
 
 
 def display_important_items(project_name, base_dir):
     """Display all important items from a project's notes."""
-    base_dir = os.path.expanduser(base_dir)
     project_dir = os.path.join(base_dir, project_name)
 
     if not os.path.exists(project_dir):
@@ -134,18 +217,17 @@ def display_important_items(project_name, base_dir):
         return
 
     all_important_items = []
-    for filename in os.listdir(project_dir):
-        if filename.endswith('.md') and filename != 'README.md':
-            file_path = os.path.join(project_dir, filename)
-            items = get_important_items(file_path)
-            all_important_items.extend(items)
+    with os.scandir(project_dir) as entries:
+        for entry in entries:
+            if entry.name.endswith('.md') and entry.name != 'README.md' and entry.is_file():
+                all_important_items.extend(get_important_items(entry.path))
 
     if not all_important_items:
         print(f"No important items found in project '{project_name}'")
         return
 
-    print(f"\nImportant Items for project '{project_name}':")
-    print("-" * 50)
+    # Collect the output and write it in one go
+    lines = [f"\nImportant Items for project '{project_name}':", "-" * 50]
 
     # Sort items by date
     all_important_items.sort(key=lambda x: x['date'], reverse=True)
@@ -154,114 +236,122 @@ def display_important_items(project_name, base_dir):
     for item in all_important_items:
         if current_date != item['date']:
             current_date = item['date']
-            print(f"\n***** {current_date} *****\n")
-        print(f"[{item['section']}] \n\n {item['item']}")
+            lines.append(f"\n***** {current_date} *****\n")
+        lines.append(f"[{item['section']}] \n\n {item['item']}")
+    print("\n".join(lines))
 
 def get_expected_tasks(filename):
     """Extract expected tasks for tomorrow from the current note."""
-    if not os.path.exists(filename):
-        return []
+    return get_carry_tasks(filename)[1]
+
 
-    with open(filename, 'r') as file:
-        content = file.read()
+@contextlib.contextmanager
+def _open_note_buffer(filename):
+    """Yield the raw bytes of a note, memory-mapped when the file is large.
 
-    tasks = []
-    in_expected_section = False
+    Small notes are cheaper to read() in one go; anything from
+    _MMAP_THRESHOLD up is mapped read-only so scans run straight over the
+    page cache. Both buffer types support find() and slicing.
+    """
+    with open(filename, 'rb') as file:
+        size = os.fstat(file.fileno()).st_size
+        if size < _MMAP_THRESHOLD:
+            yield file.read()
+            return
 
-    for line in content.split('\n'):
-        if '## Expected for Tomorrow' in line:
-            in_expected_section = True
-        elif line.startswith('##'):
-            in_expected_section = False
-        elif in_expected_section and line.startswith('-'):
-            tasks.append(line)
+        import mmap
 
-    return tasks
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            yield buffer
 
 
 def count_completed_tasks(filename):
     """Count completed tasks in a note file."""
-    if not os.path.exists(filename):
+    try:
+        with _open_note_buffer(filename) as buffer:
+            if isinstance(buffer, bytes):
+                return buffer.count(_CHECK_DONE)
+            completed_tasks = 0
+            pos = buffer.find(_CHECK_DONE)
+            while pos != -1:
+                completed_tasks += 1
+                pos = buffer.find(_CHECK_DONE, pos + len(_CHECK_DONE))
+            return completed_tasks
+    except FileNotFoundError:
         return 0
 
-    with open(filename, 'r') as file:
-        content = file.read()
 
-    completed_tasks = content.count('- [x]')
-    return completed_tasks
+def _scan_project_notes(project_dir):
+    """Map note dates (YYYY-MM-DD) to file paths with a single directory read."""
+    with os.scandir(project_dir) as entries:
+        return {entry.name[:-3]: entry.path for entry in entries
+                if entry.name.endswith('.md') and entry.name != 'README.md'
+                and entry.is_file()}
+
+
+# Graph characters indexed by activity level
+_LEVEL_CHARS = ('·', '░', '▒', '▓', '█')
+
+
+def _level_for(completed_tasks):
+    """Calculate activity level (0-4) from a note's completed task count."""
+    if completed_tasks is None:
+        return 0  # No activity
+    if completed_tasks == 0:
+        return 1  # Light green for just creating a note
+    return min(4, 1 + completed_tasks // 3)  # More tasks = darker green
 
 
 def generate_contribution_graph(project_name, base_dir, months=12):
     """Generate a GitHub-like contribution graph for the project."""
-    base_dir = os.path.expanduser(base_dir)
     project_dir = os.path.join(base_dir, project_name)
 
     if not os.path.exists(project_dir):
         print(f"Project '{project_name}' does not exist.")
         return
 
+    lines = []
+
     # Calculate date range
     end_date = date.today()
     start_date = end_date - timedelta(days=months * 30)  # Approximate months
 
+    # Note name of every day in the window, computed once from day ordinals
+    date_strs = [date.fromordinal(ordinal).isoformat()
+                 for ordinal in range(start_date.toordinal(), end_date.toordinal() + 1)]
+
+    # Count completed tasks only for notes that exist inside the window
+    start_str, end_str = start_date.isoformat(), end_date.isoformat()
+    counts = {date_str: count_completed_tasks(path)
+              for date_str, path in _scan_project_notes(project_dir).items()
+              if start_str <= date_str <= end_str}
+
     # Collect data
-    contribution_data = {}
-    current_date = start_date
-    while current_date <= end_date:
-        date_str = current_date.strftime("%Y-%m-%d")
-        filename = os.path.join(project_dir, f"{date_str}.md")
-
-        if os.path.exists(filename):
-            completed_tasks = count_completed_tasks(filename)
-            # Calculate activity level (0-4)
-            if completed_tasks == 0:
-                level = 1  # Light green for just creating a note
-            else:
-                level = min(4, 1 + math.floor(completed_tasks / 3))  # More tasks = darker green
-        else:
-            level = 0  # No activity
-
-        contribution_data[date_str] = level
-        current_date += timedelta(days=1)
+    levels = [_level_for(counts.get(date_str)) for date_str in date_strs]
 
     # Generate ASCII visualization
-    print(f"\nContribution graph for {project_name} (last {months} months):")
-    print("Less " + "─" * 20 + " More")
-    print("█ = High activity  ▓ = Medium  ▒ = Low  ░ = Very Low  · = None\n")
+    lines.append(f"\nContribution graph for {project_name} (last {months} months):")
+    lines.append("Less " + "─" * 20 + " More")
+    lines.append("█ = High activity  ▓ = Medium  ▒ = Low  ░ = Very Low  · = None\n")
 
     # Generate month labels
-    months_label = ""
-    current_date = start_date
-    while current_date <= end_date:
-        if current_date.day == 1:
-            months_label += f"{current_date.strftime('%b')}   "
-        current_date += timedelta(days=1)
-    print(months_label)
-
-    # Generate the graph
+    months_label = []
+    year, month = start_date.year, start_date.month
+    if start_date.day != 1:
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    while date(year, month, 1) <= end_date:
+        months_label.append(f"{date(year, month, 1).strftime('%b')}   ")
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    lines.append("".join(months_label))
+
+    # Generate the graph, one row per weekday stepping a week at a time
     for day_of_week in range(7):
-        row = ""
-        current_date = start_date + timedelta(days=(7 - start_date.weekday() + day_of_week) % 7)
-        while current_date <= end_date:
-            date_str = current_date.strftime("%Y-%m-%d")
-            level = contribution_data.get(date_str, 0)
-
-            # Use different characters for different activity levels
-            if level == 0:
-                row += "·"
-            elif level == 1:
-                row += "░"
-            elif level == 2:
-                row += "▒"
-            elif level == 3:
-                row += "▓"
-            else:
-                row += "█"
-
-            row += " "
-            current_date += timedelta(days=7)
-        print(row)
-    print()
+        first_day = (7 - start_date.weekday() + day_of_week) % 7
+        cells = [_LEVEL_CHARS[levels[index]] for index in range(first_day, len(date_strs), 7)]
+        lines.append(" ".join(cells))
+    lines.append("")
+
+    print("\n".join(lines))
 
 
 def find_last_note(project_dir):
@@ -269,36 +359,34 @@ def find_last_note(project_dir):
     if not os.path.exists(project_dir):
         return None
 
-    # Get all .md files except README.md
-    note_files = [f for f in os.listdir(project_dir)
-                  if f.endswith('.md') and f != 'README.md']
+    # Files are named YYYY-MM-DD.md, so the largest name is the most recent
+    with os.scandir(project_dir) as entries:
+        last_note = max((entry.name for entry in entries
+                         if entry.name.endswith('.md') and entry.name != 'README.md'
+                         and entry.is_file()),
+                        default=None)
 
-    if not note_files:
+    if last_note is None:
         return None
 
-    # Sort files by date (files are named YYYY-MM-DD.md)
-    note_files.sort(reverse=True)
-
-    # Return the most recent file
-    return os.path.join(project_dir, note_files[0])
+    return os.path.join(project_dir, last_note)
 
 
 def create_project(project_name, base_dir):
     """Create a new project directory and initial note."""
-    base_dir = os.path.expanduser(base_dir)
     project_dir = os.path.join(base_dir, project_name)
 
-    if os.path.exists(project_dir):
+    try:
+        os.makedirs(project_dir)
+    except FileExistsError:
         print(f"Project '{project_name}' already exists.")
         return False
-
-    os.makedirs(project_dir)
     print(f"Created new project directory: {project_dir}")
 
     # Create initial README
     readme_path = os.path.join(project_dir, "README.md")
     with open(readme_path, "w") as f:
-        f.write(f"# {project_name}\n\nProject created on {datetime.now().strftime('%Y-%m-%d')}")
+        f.write(f"# {project_name}\n\nProject created on {date.today().isoformat()}")
 
     # Create first daily note
     create_daily_note(project_name, base_dir)
@@ -313,21 +401,16 @@ def open_vscode(base_dir):
     """
     import subprocess
 
-    base_dir = os.path.expanduser(base_dir)
     subprocess.Popen(['code', base_dir])
 
 def list_projects(base_dir):
     """List all existing projects in the base directory."""
-    base_dir = os.path.expanduser(base_dir)
     if not os.path.exists(base_dir):
         print(f"No projects found. Base directory '{base_dir}' does not exist.")
         return
 
-    projects = []
-    for item in os.listdir(base_dir):
-        item_path = os.path.join(base_dir, item)
-        if os.path.isdir(item_path):
-            projects.append(item)
+    with os.scandir(base_dir) as entries:
+        projects = [entry.name for entry in entries if entry.is_dir()]
 
     if not projects:
         print("No projects found.")
@@ -341,11 +424,8 @@ def list_projects(base_dir):
 
 def create_daily_note(project_name, base_dir="notes"):
     # Get today's date
-    today = datetime.now()
-    today_str = today.strftime("%Y-%m-%d")
+    today_str = date.today().isoformat()
 
-    # Expand the ~ in the path to the user's home directory
-    base_dir = os.path.expanduser(base_dir)
     project_dir = os.path.join(base_dir, project_name)
 
     # Check if project exists
@@ -363,90 +443,154 @@ def create_daily_note(project_name, base_dir="notes"):
     carried_tasks = []
     expected_tasks = []
     if last_note:
-        carried_tasks = get_incomplete_tasks(last_note)
-        carried_tasks.extend(get_expected_tasks(last_note))
+        carried_tasks, last_expected_tasks = get_carry_tasks(last_note)
+        carried_tasks.extend(last_expected_tasks)
         last_note_date = os.path.basename(last_note).replace('.md', '')
         print(f"Processing tasks from last note: {last_note_date}")
 
     carried_tasks_str = "\n".join(carried_tasks) if carried_tasks else get_template_tasks()
     expected_tasks_str = "- No expected tasks" if not expected_tasks else "\n".join(expected_tasks)
 
-    # Check if today's file already exists
-    if os.path.exists(today_filename):
+    # Create the file and write the template, unless today's file already exists
+    try:
+        with open(today_filename, "x") as file:
+            file.write(TEMPLATE.format(
+                date=today_str,
+                project_name=project_name,
+                carried_tasks=carried_tasks_str,
+                expected_tasks=expected_tasks_str
+            ))
+    except FileExistsError:
         print(f"File '{today_filename}' already exists.")
         return False
-
-    # Create the file and write the template
-    with open(today_filename, "w") as file:
-        file.write(TEMPLATE.format(
-            date=today_str,
-            project_name=project_name,
-            carried_tasks=carried_tasks_str,
-            expected_tasks=expected_tasks_str
-        ))
     print(f"Created file '{today_filename}' with the daily note template.")
     if carried_tasks:
         print(f"Carried over {len(carried_tasks)} incomplete tasks from last note.")
     return True
 
 
-def main():
-    parser = argparse.ArgumentParser(description="Manage daily notes for projects.")
-    parser.add_argument("--base-dir", default="~/.notes", help="Base directory to save notes (default: '~/.notes')")
+def _config_action(args):
+    """Return "apply" when the config command was given values, else "show"."""
+    return "apply" if args.base_dir is not None else "show"
+
+
+def run_config(args):
+    """Handle the config command."""
+    if _config_action(args) == "apply":
+        set_base_dir(args.base_dir)
+        print(f"Base directory set to: {args.base_dir}")
+    else:
+        print(f"Base directory: {load_config().get('base_dir', _DEFAULT_BASE_DIR)}")
 
-    subparsers = parser.add_subparsers(dest="command", help="Commands")
 
-    subparsers.add_parser("code", help="Open vscode")
+def _build_code_parser(subparsers):
+    code_parser = subparsers.add_parser("code", help="Open vscode")
+    code_parser.set_defaults(func=lambda args: open_vscode(args.base_dir))
 
+
+def _build_new_parser(subparsers):
     # New project command
     new_parser = subparsers.add_parser("new", help="Create a new project")
     new_parser.add_argument("project_name", help="Name of the project")
+    new_parser.set_defaults(func=lambda args: create_project(args.project_name, args.base_dir))
+
 
+def _build_list_parser(subparsers):
     # List projects command
     list_parser = subparsers.add_parser("list", help="List existing projects")
     list_parser.add_argument("--months", type=int, default=12, help="Number of months to show in contribution graph")
+    list_parser.set_defaults(func=lambda args: list_projects(args.base_dir))
+
 
+def _build_daily_parser(subparsers):
     # Create daily note command
     daily_parser = subparsers.add_parser("daily", help="Create a daily note for a project")
     daily_parser.add_argument("project_name", help="Name of the project")
+    daily_parser.set_defaults(func=lambda args: create_daily_note(args.project_name, args.base_dir))
 
+
+def _build_stats_parser(subparsers):
     # Stats command
     stats_parser = subparsers.add_parser("stats", help="Show contribution graph for a specific project")
     stats_parser.add_argument("project_name", help="Name of the project")
     stats_parser.add_argument("--months", type=int, default=12, help="Number of months to show in contribution graph")
+    stats_parser.set_defaults(
+        func=lambda args: generate_contribution_graph(args.project_name, args.base_dir, args.months))
 
 
+def _build_important_parser(subparsers):
     important_parser = subparsers.add_parser("i", help="Show important items from project notes")
     important_parser.add_argument("project_name", help="Name of the project")
+    important_parser.set_defaults(func=lambda args: display_important_items(args.project_name, args.base_dir))
+
 
+def _build_config_parser(subparsers):
     # Add config subcommand
     config_parser = subparsers.add_parser("config", help="Configure noter settings")
-    config_parser.add_argument("--base-dir", default="~/.notes", help="Base directory to save notes (default: '~/.notes')")
+    config_parser.add_argument("--base-dir", help="Base directory to save notes (shows the current one when omitted)")
+    config_parser.set_defaults(func=run_config)
 
-    args = parser.parse_args()
 
-    if args.command == "config":
-        set_base_dir(args.base_dir)
-        print(f"Base directory set to: {args.base_dir}")
-        return
+# Subparser builders in the order they are listed in --help
+SUBPARSER_BUILDERS = {
+    "code": _build_code_parser,
+    "new": _build_new_parser,
+    "list": _build_list_parser,
+    "daily": _build_daily_parser,
+    "stats": _build_stats_parser,
+    "i": _build_important_parser,
+    "config": _build_config_parser,
+}
+
+
+def _sniff_subcommand(argv):
+    """Return the subcommand named in argv, or None when it can't be told apart.
+
+    Only the top-level options are understood here; anything unexpected
+    returns None so the caller falls back to building the full parser.
+    """
+    args = iter(argv)
+    for arg in args:
+        if arg == "-h" or (len(arg) > 2 and "--help".startswith(arg)):
+            return None  # Top-level help, abbreviated or not, lists every subcommand
+        if len(arg) > 2 and "=" not in arg and "--base-dir".startswith(arg):
+            next(args, None)  # Skip the option's value
+        elif not arg.startswith("-"):
+            return arg if arg in SUBPARSER_BUILDERS else None
+    return None
+
+
+def build_parser(command=None):
+    """Build the argument parser, limited to one subcommand when given."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Manage daily notes for projects.")
+    parser.add_argument("--base-dir", default="~/.notes", help="Base directory to save notes (default: '~/.notes')")
+
+    subparsers = parser.add_subparsers(dest="command", required=True, help="Commands")
 
-    config = load_config()
-    args.base_dir = config["base_dir"]
-
-    if args.command == "new":
-        create_project(args.project_name, args.base_dir)
-    elif args.command == "code":
-        open_vscode(args.base_dir)
-    elif args.command == "list":
-        list_projects(args.base_dir)
-    elif args.command == "daily":
-        create_daily_note(args.project_name, args.base_dir)
-    elif args.command == "stats":
-        generate_contribution_graph(args.project_name, args.base_dir, args.months)
-    elif args.command == "i":
-        display_important_items(args.project_name, args.base_dir)
+    if command is None:
+        builders = SUBPARSER_BUILDERS.values()
     else:
-        parser.print_help()
+        builders = [SUBPARSER_BUILDERS[command]]
+    for build in builders:
+        build(subparsers)
+
+    return parser
+
+
+def main():
+    # Only the subparser for the requested command needs to be built
+    parser = build_parser(_sniff_subcommand(sys.argv[1:]))
+
+    args = parser.parse_args()
+
+    # The config command manages base_dir itself, everything else reads it
+    if args.command != "config":
+        config = load_config()
+        args.base_dir = config["base_dir"]
+
+    args.func(args)
 
 
 if __name__ == "__main__":